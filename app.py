@@ -1,9 +1,13 @@
 from flask import Flask, render_template, request, jsonify
+from urllib.parse import parse_qs
 import socketio
 import eventlet
 import converter as cv
-from board import game
-from arduino_controller import ArduinoController
+from board import Chess6x6
+from board_manager import BoardManager
+from clock import ClockService
+import itertools
+import math
 import time
 
 app = Flask(__name__)
@@ -12,160 +16,343 @@ app = Flask(__name__)
 sio = socketio.Server(cors_allowed_origins="*")
 app.wsgi_app = socketio.WSGIApp(sio, app.wsgi_app)
 
-# Initialize Arduino controller globally
-arduino = ArduinoController()
+# Pool of physical boards; each game session is bound to one of them
+boards = BoardManager()
 
-# Create a flag to track if we're already monitoring the board
-monitoring_black_moves = False
+# Seconds to wait for a board to answer before treating it as stuck
+COMMAND_TIMEOUT = 5
+MOVE_TIMEOUT = 300
+
+# Time control for each side (seconds) and increment added after every move
+INITIAL_TIME = 600
+INCREMENT = 0
+
+# Game sessions by id. Clients that do not name a game play the default one
+DEFAULT_GAME_ID = 'default'
+games = {}
+game_numbers = itertools.count(1)
+
+# Games whose physical board is currently being watched for black's move
+monitored_games = set()
+
+def on_clock_timeout(game_id, clock):
+    """Called by the clock scheduler when a side runs out of time."""
+    print(f"⏰ {clock.flagged.capitalize()} ran out of time in game {game_id}")
+    sio.emit('clock_sync', clock.to_message(), room=game_id)
+
+# One scheduler flags timeouts for every game's clock
+clocks = ClockService(on_timeout=on_clock_timeout)
+
+def create_game(game_id, initial=INITIAL_TIME, increment=INCREMENT):
+    """
+    Start a new game session with its own board state and clock, and bind
+    a free physical board to it if there is one.
+    """
+    games[game_id] = Chess6x6()
+    clocks.create(game_id, initial, increment)
+    board = boards.bind(game_id)
+    print(f"🎲 Game {game_id} created on board {board.port if board else None}")
+    return games[game_id]
+
+def next_game_id():
+    """Return a generated game id that is not in use and has never been handed out."""
+    while True:
+        game_id = f"game-{next(game_numbers)}"
+        if game_id not in games:
+            return game_id
+
+def end_game(game_id):
+    """
+    End a game session: free its physical board for the next game and drop
+    its clock. A running monitor notices the game is gone and stops.
+    """
+    games.pop(game_id)
+    clocks.remove(game_id)
+    boards.release(game_id)
+    sio.emit('game_ended', {'game_id': game_id}, room=game_id)
+    sio.close_room(game_id)
+    print(f"🏁 Game {game_id} ended")
+
+def game_info(game_id):
+    """Summary of a game session for listings."""
+    board = boards.board_for(game_id)
+    clock = clocks.get(game_id)
+    return {
+        'game_id': game_id,
+        'turn': games[game_id].get_turn(),
+        'initial': clock.initial,
+        'increment': clock.increment,
+        'board_port': board.port if board else None
+    }
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/games', methods=['GET'])
+def list_games():
+    """Lists all game sessions and the physical board each is bound to."""
+    return jsonify([game_info(game_id) for game_id in games])
+
+@app.route('/games', methods=['POST'])
+def new_game():
+    """
+    Creates a new game session, bound to a free physical board if any.
+    Optional form fields: initial and increment (seconds) for the time control.
+    """
+    game_id = request.form.get('game_id', '').strip() or next_game_id()
+    if game_id in games:
+        return jsonify({'success': False, 'error': 'session', 'message': 'Game already exists'}), 409
+
+    try:
+        initial = float(request.form.get('initial', INITIAL_TIME))
+        increment = float(request.form.get('increment', INCREMENT))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'time_control', 'message': 'Invalid time control'}), 400
+    if not (math.isfinite(initial) and math.isfinite(increment)) or initial <= 0 or increment < 0:
+        return jsonify({'success': False, 'error': 'time_control', 'message': 'Invalid time control'}), 400
+
+    create_game(game_id, initial, increment)
+    return jsonify({'success': True, **game_info(game_id)})
+
+@app.route('/games/<game_id>', methods=['DELETE'])
+def delete_game(game_id):
+    """Ends a game session and frees its physical board."""
+    if game_id not in games:
+        return jsonify({'success': False, 'error': 'session', 'message': 'Unknown game'}), 404
+    if game_id == DEFAULT_GAME_ID:
+        return jsonify({'success': False, 'error': 'session', 'message': 'The default game cannot be ended'}), 400
+    end_game(game_id)
+    return jsonify({'success': True, 'game_id': game_id})
+
 @app.route('/board', methods=['GET'])
 def get_board():
     """Returns the current state of the board as JSON."""
+    game = games.get(request.args.get('game_id', DEFAULT_GAME_ID))
+    if game is None:
+        return jsonify({'error': 'session', 'message': 'Unknown game'}), 404
     return jsonify({
         'board': game.get_board(),
         'turn': game.get_turn()
     })
 
+def board_payload(game_id):
+    """Build the board update sent to clients after a move."""
+    game = games[game_id]
+    return {
+        'game_id': game_id,
+        'board': game.get_board(),
+        'turn': game.get_turn(),
+        'last_move': game.get_last_move()
+    }
+
+def emit_clock_sync(game_id, room=None):
+    """Send the compact clock state; clients count down locally between syncs."""
+    sio.emit('clock_sync', clocks.get(game_id).to_message(), room=room or game_id)
+
+def apply_move(game_id, move, pause_clock=False):
+    """
+    Parse, validate and apply a move given in chess notation (e.g., 'e2 e4')
+    to a game session. Malformed input is rejected before the game engine
+    is touched. With pause_clock, the opponent's clock stays paused until
+    resume_clock() is called, e.g. while the physical board replays the move.
+
+    Returns None on success, or an error dict {'error': ..., 'message': ...}.
+    """
+    game = games.get(game_id)
+    if game is None:
+        return {'error': 'session', 'message': 'Unknown game'}
+
+    try:
+        start, end = cv.parse_move(move)
+    except ValueError as e:
+        return {'error': 'format', 'message': str(e)}
+
+    if clocks.get(game_id).flagged:
+        return {'error': 'timeout', 'message': 'Out of time'}
+
+    if not game.is_valid_move(start, end):
+        return {'error': 'illegal', 'message': 'Invalid move'}
+
+    # Charge the mover's clock before applying the move
+    if not clocks.press(game_id):
+        return {'error': 'timeout', 'message': 'Out of time'}
+
+    if pause_clock:
+        clocks.stop(game_id)
+
+    game.move(start, end)
+    emit_clock_sync(game_id)
+    return None
+
+def resume_clock(game_id):
+    """Restart a game's clock for the side to move after a pause."""
+    if game_id not in games:
+        return  # The game ended while its clock was paused
+    clocks.start(game_id, games[game_id].get_turn())
+    emit_clock_sync(game_id)
+
 @app.route('/move', methods=['POST'])
 def make_move():
     """Handle moves from the web interface (White's moves)."""
-    move = request.form['move'].strip()
-    print(f"Move received: {move}")
+    game_id = request.form.get('game_id', DEFAULT_GAME_ID)
+    move = request.form.get('move', '').strip()
+    print(f"Move received for game {game_id}: {move}")
     
-    if len(move) == 5 and move[2] == ' ':
-        start = (6 - int(move[1]), ord(move[0]) - ord('a'))
-        end = (6 - int(move[4]), ord(move[3]) - ord('a'))
-
-        if game.move(start, end):
-            # IMMEDIATELY broadcast the updated board to all clients
-            # This ensures the web interface updates right away
-            sio.emit('update_board', {
-                'board': game.get_board(),
-                'turn': game.get_turn(),
-                'last_move': game.get_last_move()
-            })
-            
-            # Convert chess move to physical coordinates
-            physical_command = cv.chess_to_physical_coords(move)
-            print(f"Physical command: {physical_command}")
-            
-            try:
-                # Send command to Arduino
-                arduino.send_command(physical_command)
-                print("✅ Move command sent to Arduino")
-                
-                # Wait for Arduino to complete the move
-                if arduino.wait_for_move_completion():
-                    print("✅ Physical move completed")
-                else:
-                    print("⚠️ Timeout waiting for move completion")
-            except Exception as e:
-                print(f"❌ Failed to send command to Arduino: {e}")
-            
-            # If it's now black's turn, start monitoring the physical board in background
-            if game.get_turn() == "black":
-                start_black_move_monitoring()
-                
-            return jsonify({'success': True, 'board': game.get_board()})
+    # Black cannot move until the board has replayed this move, so their clock waits
+    error = apply_move(game_id, move, pause_clock=True)
+    if error:
+        print(f"❌ {error['message']}")
+        return jsonify({'success': False, **error})
 
-    return jsonify({'success': False})
+    # IMMEDIATELY broadcast the updated board to the game's clients
+    # This ensures the web interface updates right away
+    payload = board_payload(game_id)
+    sio.emit('update_board', payload, room=game_id)
+    
+    # Drive the physical board in the background so the request returns at once
+    eventlet.spawn(execute_physical_move, game_id, move)
+        
+    return jsonify({'success': True, 'board': payload['board']})
 
-def start_black_move_monitoring():
-    """Start monitoring for black's move in a non-blocking background task."""
-    global monitoring_black_moves
+def execute_physical_move(game_id, move):
+    """
+    Background task that replays a move on the game's physical board.
+    The clock was paused by make_move and restarts once the replay is over.
+    """
+    # Convert chess move to physical coordinates
+    physical_command = cv.chess_to_physical_coords(move)
+    print(f"Physical command for game {game_id}: {physical_command}")
+    
+    if game_id not in games:
+        return  # The game ended before the board could replay the move
     
-    # Avoid starting multiple monitoring tasks
-    if monitoring_black_moves:
-        print("👁️ Already monitoring physical board")
+    board = boards.bind(game_id)
+    if board is None:
+        print(f"❌ No physical board available for game {game_id}")
+        resume_clock(game_id)
+        return
+    
+    try:
+        # Send command to Arduino on the board's own I/O worker
+        board.call('send_command', physical_command, timeout=COMMAND_TIMEOUT)
+        print("✅ Move command sent to Arduino")
+        
+        # Wait for Arduino to complete the move
+        if board.call('wait_for_move_completion', MOVE_TIMEOUT, timeout=MOVE_TIMEOUT + COMMAND_TIMEOUT):
+            print("✅ Physical move completed")
+        else:
+            print("⚠️ Timeout waiting for move completion")
+    except Exception as e:
+        print(f"❌ Failed to send command to Arduino: {e}")
+    finally:
+        resume_clock(game_id)
+    
+    # If it's now black's turn, start monitoring the physical board in background
+    game = games.get(game_id)
+    if game and game.get_turn() == "black":
+        start_black_move_monitoring(game_id)
+
+def start_black_move_monitoring(game_id):
+    """Start monitoring a game's board for black's move in a non-blocking background task."""
+    # Avoid starting multiple monitoring tasks for the same game
+    if game_id in monitored_games:
+        print(f"👁️ Already monitoring physical board for game {game_id}")
         return
     
-    print("👁️ Black's turn - starting background monitoring of physical board")
-    monitoring_black_moves = True
+    print(f"👁️ Black's turn in game {game_id} - starting background monitoring of physical board")
+    monitored_games.add(game_id)
     
     # Start monitoring in a background task using eventlet
-    eventlet.spawn(monitor_black_move)
+    eventlet.spawn(monitor_black_move, game_id)
 
-def monitor_black_move():
-    """Background task that monitors the physical board for black's move."""
-    global monitoring_black_moves
+def monitor_black_move(game_id):
+    """Background task that monitors a game's physical board for black's move."""
+    game = games.get(game_id)
     
     try:
-        print("🔍 Starting to monitor physical board for black's move...")
+        if game is None:
+            return  # The game ended before monitoring started
+        
+        print(f"🔍 Starting to monitor physical board for black's move in game {game_id}...")
+        
+        board = boards.bind(game_id)
+        if board is None:
+            print(f"❌ No physical board available for game {game_id}")
+            return
         
         # Take an initial snapshot of the board
-        initial_state = get_current_board_state(verbose=True)  # Verbose for initial state
+        initial_state = get_current_board_state(board, verbose=True)  # Verbose for initial state
         if not initial_state:
             print("❌ Could not read initial board state")
-            monitoring_black_moves = False
             return
         
         print("✅ Initial board state captured, waiting for move...")
         
-        # Poll until we detect a change or it's no longer Black's turn
-        attempts = 0
-        max_attempts = 600  # 10 minutes at 1s intervals
+        # Poll until we detect a change, it's no longer Black's turn or Black's clock runs out
+        clock = clocks.get(game_id)
+        polls = 0
         
-        while game.get_turn() == "black" and attempts < max_attempts:
+        # Stop as soon as the game is ended, even if a new game reuses its id
+        while games.get(game_id) is game and game.get_turn() == "black" and not clock.flagged:
             # Wait a moment between checks
             eventlet.sleep(1)  # Use eventlet.sleep instead of time.sleep
-            attempts += 1
+            polls += 1
             
             # Print waiting message less frequently
-            if attempts % 30 == 0:
-                print(f"Still waiting for physical move... ({attempts} seconds / {max_attempts} seconds)")
+            if polls % 30 == 0:
+                print(f"Still waiting for physical move in game {game_id}... "
+                      f"({clock.time_left('black'):.0f} seconds left)")
             
             # Read current state silently (non-verbose)
-            current_state = get_current_board_state(verbose=False)
+            current_state = get_current_board_state(board, verbose=False)
             if not current_state:
                 continue  # Skip this iteration if read failed
             
             # Check if a move was made
-            move = arduino.detect_move(initial_state, current_state)
+            move = board.controller.detect_move(initial_state, current_state)
             if move:
                 # When a change is detected, print the current state
-                print(f"💡 Board state changed: {arduino.matrix_to_string(current_state)}")
+                print(f"💡 Board state changed: {board.controller.matrix_to_string(current_state)}")
                 print(f"Detected move from physical board: {move}")
                 
-                # Parse chess notation to board coordinates
-                start_file, start_rank = move[0], move[1]
-                end_file, end_rank = move[3], move[4]
-                
-                start = (6 - int(start_rank), ord(start_file) - ord('a'))
-                end = (6 - int(end_rank), ord(end_file) - ord('a'))
-                
-                if game.move(start, end):
+                if apply_move(game_id, move) is None:
                     print(f"✅ Move applied: {move}")
-                    # Broadcast the updated board to all connected clients
-                    sio.emit('update_board', {
-                        'board': game.get_board(),
-                        'turn': game.get_turn(),
-                        'last_move': game.get_last_move()
-                    })
+                    # Broadcast the updated board to the game's clients
+                    sio.emit('update_board', board_payload(game_id), room=game_id)
                     break  # Exit the loop after a successful move
                 else:
                     print("❌ Invalid move detected from physical board")
         
-        if game.get_turn() == "black":
+        if clock.flagged == "black":
             print("⚠️ Timed out waiting for physical move")
     
     finally:
-        # Always reset the monitoring flag when done
-        monitoring_black_moves = False
-        print("👁️ Stopped monitoring physical board")
+        # Always clear the monitoring flag when done
+        monitored_games.discard(game_id)
+        print(f"👁️ Stopped monitoring physical board for game {game_id}")
 
 # WebSocket events
 @sio.event
 def connect(sid, environ):
-    print(f"✅ Client {sid} connected")
+    # Clients pick their game with ?game_id=... on the Socket.IO URL
+    query = parse_qs(environ.get('QUERY_STRING', ''))
+    game_id = query.get('game_id', [DEFAULT_GAME_ID])[0]
+    if game_id not in games:
+        print(f"❌ Client {sid} asked for unknown game {game_id}")
+        return False
+    
+    print(f"✅ Client {sid} connected to game {game_id}")
+    sio.enter_room(sid, game_id)
+    
     # Send current game state to new client
+    game = games[game_id]
     sio.emit('update_board', {
+        'game_id': game_id,
         'board': game.get_board(),
         'turn': game.get_turn()
     }, room=sid)
+    emit_clock_sync(game_id, room=sid)
 
 @sio.event
 def disconnect(sid):
@@ -174,46 +361,41 @@ def disconnect(sid):
 @sio.on('move_from_real_board')
 def handle_move(sid, data):
     """Handle moves sent from the web client that were detected on the physical board."""
-    move = data['move']
-    print(f"📥 Move received from client {sid}: {move}")
+    if not isinstance(data, dict):
+        data = {}
+    game_id = data.get('game_id', DEFAULT_GAME_ID)
+    move = data.get('move')
+    print(f"📥 Move received from client {sid} for game {game_id}: {move}")
 
-    if len(move) == 5 and move[2] == ' ':
-        start = (6 - int(move[1]), ord(move[0]) - ord('a'))
-        end = (6 - int(move[4]), ord(move[3]) - ord('a'))
+    error = apply_move(game_id, move)
+    if error:
+        print(f"❌ {error['message']}")
+        sio.emit('move_rejected', error, room=sid)
+        return
 
-        if game.move(start, end):
-            print(f"✅ Move applied: {move}")
-            
-            # IMMEDIATELY broadcast the updated board to all connected clients
-            sio.emit('update_board', {
-                'board': game.get_board(),
-                'turn': game.get_turn(),
-                'last_move': game.get_last_move()
-            })
-            
-            # If it's now black's turn, start monitoring in the background
-            if game.get_turn() == "black":
-                start_black_move_monitoring()
-        else:
-            print("❌ Invalid move")
-            sio.emit('move_rejected', {'message': 'Invalid move'}, room=sid)
-    else:
-        print("❌ Incorrect move format")
-        sio.emit('move_rejected', {'message': 'Incorrect move format'}, room=sid)
+    print(f"✅ Move applied: {move}")
+    
+    # IMMEDIATELY broadcast the updated board to the game's clients
+    sio.emit('update_board', board_payload(game_id), room=game_id)
+    
+    # If it's now black's turn, start monitoring in the background
+    if games[game_id].get_turn() == "black":
+        start_black_move_monitoring(game_id)
 
-def get_current_board_state(verbose=False):
+def get_current_board_state(board, verbose=False):
     """
     Helper function to get board state matrix from Arduino
     
     Args:
+        board (BoardSession): Board to read from
         verbose (bool): Whether to print verbose output
     """
     try:
-        # Read state from Arduino
-        state_string = arduino.read_board_state(verbose)
+        # Read state from Arduino on the board's own I/O worker
+        state_string = board.call('read_board_state', verbose, timeout=COMMAND_TIMEOUT)
         
         if state_string and len(state_string) == 36:
-            matrix = arduino.board_state_to_matrix(state_string)
+            matrix = board.controller.board_state_to_matrix(state_string)
             if verbose:
                 print(f"Board state: {state_string}")
             return matrix
@@ -226,8 +408,11 @@ def get_current_board_state(verbose=False):
             print(f"Error reading board state: {e}")
         return None
 
-def debug_arduino_communication():
-    """Direct debugging function for Arduino communication"""
+def debug_arduino_communication(board):
+    """Direct debugging function for Arduino communication, run on the board's I/O worker"""
+    board.run(_debug_read_board, timeout=COMMAND_TIMEOUT)
+
+def _debug_read_board(arduino):
     print("🔍 DEBUGGING: Sending READ_BOARD command...")
     
     # Clear any existing data
@@ -274,15 +459,23 @@ def debug_arduino_communication():
 
 if __name__ == '__main__':
     try:
-        # Connect to Arduino before starting server
-        print("🔌 Connecting to Arduino...")
-        arduino.connect()
+        # Connect to every attached board before starting server
+        print("🔌 Connecting to Arduino boards...")
+        connected = boards.connect_all()
+        print(f"✅ {len(connected)} board(s) connected: {connected}")
+        
+        # One game session per connected board; the default game always exists
+        create_game(DEFAULT_GAME_ID)
+        for _ in connected[1:]:
+            create_game(next_game_id())
+        
+        # Reconnect dropped boards and pick up new ones in the background
+        boards.start_health_checks()
         
         print("🚀 Starting server...")
         eventlet.wsgi.server(eventlet.listen(('127.0.0.1', 5000)), app)
     except Exception as e:
         print(f"❌ Error: {e}")
     finally:
-        # Make sure to close Arduino connection when server stops
-        arduino.close()
-
+        # Make sure to close Arduino connections when server stops
+        boards.close_all()
@@ -14,26 +14,32 @@ class ArduinoController:
             print(f"Found port: {port.device}")
         return ports
 
-    def connect(self, port=None):
+    def find_ports(self):
+        """Return the devices of all ports that look like an Arduino"""
+        ports = list(serial.tools.list_ports.comports()) #['/dev/ttyACM0', '/dev/ttyACM1']
+        # Usually Arduino shows up as "USB-SERIAL CH340" or similar
+        return [p.device for p in ports
+                if "USB" in p.description or "Arduino" in p.description or "ACM" in p.description]
+
+    def connect(self, port=None, reset_delay=2):
         """
         Connect to Arduino. If no port specified, tries to find it automatically.
+
+        Args:
+            reset_delay (float): Seconds to wait for the Arduino to reset after opening
         """
         if port is None:
             # Try to find Arduino port automatically
-            ports = list(serial.tools.list_ports.comports()) #['/dev/ttyACM0', '/dev/ttyACM1']
-            for p in ports:
-                # Usually Arduino shows up as "USB-SERIAL CH340" or similar
-                if "USB" in p.description or "Arduino" in p.description or "ACM" in p.description:
-                    port = p.device
-                    print(f"Found port: {port}")
-                    break
-            if port is None:
+            found = self.find_ports()
+            if not found:
                 raise Exception("No Arduino found! Available ports: " + 
-                              str([p.device for p in ports]))
+                              str([p.device for p in serial.tools.list_ports.comports()]))
+            port = found[0]
+            print(f"Found port: {port}")
 
         try:
             self.serial = serial.Serial(port, self.baud_rate, timeout=1)
-            time.sleep(2)  # Wait for Arduino to reset
+            time.sleep(reset_delay)  # Wait for Arduino to reset
             print(f"✅ Connected to Arduino on {port}")
             return True
         except Exception as e:
@@ -64,6 +70,16 @@ class ArduinoController:
             self.serial.close()
             print("Connection closed")
 
+    def is_alive(self):
+        """
+        Health probe: ask the board for its state and check that a valid
+        answer comes back within read_board_state's short deadline.
+        A board whose firmware has hung stays silent and fails the probe.
+        """
+        if not self.serial or not self.serial.is_open:
+            return False
+        return self.read_board_state() is not None
+
     def read_board_state(self, verbose=False):
         """
         Read the current state of the physical board from hall effect sensors
@@ -0,0 +1,151 @@
+import json
+import statistics
+import time
+
+from socketio import packet
+
+import eventlet
+
+import converter as cv
+from board import Chess6x6
+from clock import ClockService
+
+# Micro-benchmarks for each stage of handling a move request.
+# Run with: python benchmark.py
+# Every stage is timed on its own so a regression shows up where it happens.
+
+MOVE = 'a2 a3'
+ROUNDS = 20
+ITERATIONS = 5000
+
+def fresh_game():
+    """Return a new game with White to move."""
+    return Chess6x6()
+
+def payload_for(game):
+    """Same shape as the update_board payload sent by app.py."""
+    return {
+        'board': game.get_board(),
+        'turn': game.get_turn(),
+        'last_move': game.get_last_move()
+    }
+
+def bench_parse():
+    cv.parse_move(MOVE)
+
+def bench_parse_rejected():
+    try:
+        cv.parse_move('z9 a3')
+    except ValueError:
+        pass
+
+game_for_validate = fresh_game()
+start, end = cv.parse_move(MOVE)
+
+def bench_validate():
+    game_for_validate.is_valid_move(start, end)
+
+# Only the two kings are left so they can shuffle back and forth forever:
+# every call makes one legal move and no board setup is timed
+game_for_move = fresh_game()
+game_for_move.board = [["."] * 6 for _ in range(6)]
+game_for_move.board[0][3] = "k"
+game_for_move.board[5][3] = "K"
+king_shuffle = [cv.parse_move(m) for m in ('d1 d2', 'd6 d5', 'd2 d1', 'd5 d6')]
+move_index = 0
+
+def bench_move():
+    global move_index
+    game_for_move.move(*king_shuffle[move_index])
+    move_index = (move_index + 1) & 3
+
+def bench_physical():
+    cv.chess_to_physical_coords(MOVE)
+
+game_for_serialise = fresh_game()
+game_for_serialise.move(start, end)
+
+def bench_serialise():
+    json.dumps(payload_for(game_for_serialise))
+
+# Times the Socket.IO packet encoding that Server.emit does for each connected
+# client. Calling emit itself with no clients returns before encoding anything
+payload = payload_for(game_for_serialise)
+
+def bench_emit():
+    packet.Packet(packet.EVENT, data=['update_board', payload], namespace='/').encode()
+
+# Pressing one clock among thousands of running games: a heap push per move.
+# Stale heap entries from earlier presses pile up here, as they would in a server
+CLOCK_GAMES = 2000
+clock_service = ClockService()
+for game_id in range(CLOCK_GAMES):
+    clock_service.create(game_id, initial=3600, increment=2)
+    clock_service.press(game_id)
+clock_index = 0
+
+def bench_clock_press():
+    global clock_index
+    clock_service.press(clock_index)
+    clock_index = (clock_index + 1) % CLOCK_GAMES
+
+def check_clock_timeouts(games=CLOCK_GAMES):
+    """
+    Run many short clocks through the scheduler and return the worst lateness
+    in milliseconds. Half the games move once, so their first deadline goes
+    stale and must be skipped; every game must flag exactly once, on the
+    side that was to move.
+    """
+    flagged = {}
+    service = ClockService(on_timeout=lambda game_id, clock: flagged.setdefault(
+        game_id, (clock.flagged, time.monotonic())))
+    expected = {}
+    for game_id in range(games):
+        service.create(game_id, initial=0.2 + (game_id % 10) * 0.02)
+        service.press(game_id)  # White moves, Black's clock starts
+        expected[game_id] = ('black', service.get(game_id).deadline())
+    for game_id in range(0, games, 2):
+        service.press(game_id)  # Black moves, White's clock starts
+        expected[game_id] = ('white', service.get(game_id).deadline())
+
+    eventlet.sleep(0.2 + 9 * 0.02 + 0.1)
+    assert len(flagged) == games, f"{len(flagged)} of {games} clocks flagged"
+    lateness = 0.0
+    for game_id, (side, flagged_at) in flagged.items():
+        expected_side, deadline = expected[game_id]
+        assert side == expected_side, f"game {game_id} flagged {side}"
+        lateness = max(lateness, flagged_at - deadline)
+    return lateness * 1000
+
+BENCHMARKS = [
+    ('parse', bench_parse),
+    ('parse (rejected)', bench_parse_rejected),
+    ('validate', bench_validate),
+    ('move', bench_move),
+    ('physical coords', bench_physical),
+    ('serialise', bench_serialise),
+    ('emit', bench_emit),
+    ('clock press', bench_clock_press),
+]
+
+def run(func, rounds=ROUNDS, iterations=ITERATIONS):
+    """Time func over several rounds and return per-call times in microseconds."""
+    timings = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start_time
+        timings.append(elapsed / iterations * 1e6)
+    return timings
+
+if __name__ == "__main__":
+    print(f"{'stage':<18}{'min (us)':>10}{'mean (us)':>11}{'stddev':>9}{'ops/s':>12}")
+    for name, func in BENCHMARKS:
+        timings = run(func)
+        mean = statistics.mean(timings)
+        print(f"{name:<18}{min(timings):>10.3f}{mean:>11.3f}"
+              f"{statistics.stdev(timings):>9.3f}{1e6 / mean:>12.0f}")
+
+    print(f"clock timeouts: {CLOCK_GAMES} games flagged, "
+          f"worst lateness {check_clock_timeouts():.2f} ms")
@@ -1,28 +1,3 @@
-import socketio
-
-# Connection to Flask-SocketIO server
-sio = socketio.Client()
-
-try:
-    sio.connect('http://localhost:5000')
-    print("🔌 Connected to Flask-SocketIO server")
-    
-    while True:
-        move = input("📝 Enter your move (ex: d5 d4): ").strip()
-
-        if len(move) == 5 and move[2] == ' ':
-            print(f"📤 Sending move: {move}")
-            sio.emit('move_from_real_board', {'move': move})
-        else:
-            print("❌ Incorrect format! Use the format: d5 d4")
-
-except Exception as e:
-    print(f"❌ Error: {e}")
-
-finally:
-    sio.disconnect()
-    print("🔌 Disconnected from server")
-
 class Chess6x6:
     # Initialize 6x6 chess board
     INITIAL_BOARD = [
@@ -145,7 +120,28 @@ class Chess6x6:
         """Returns the last move made, if any."""
         return self.move_history[-1] if self.move_history else None
 
-# Create a global instance of the game
-game = Chess6x6()
+if __name__ == "__main__":
+    import socketio
+
+    # Connection to Flask-SocketIO server
+    sio = socketio.Client()
+
+    try:
+        sio.connect('http://localhost:5000')
+        print("🔌 Connected to Flask-SocketIO server")
+    
+        while True:
+            move = input("📝 Enter your move (ex: d5 d4): ").strip()
+
+            if len(move) == 5 and move[2] == ' ':
+                print(f"📤 Sending move: {move}")
+                sio.emit('move_from_real_board', {'move': move})
+            else:
+                print("❌ Incorrect format! Use the format: d5 d4")
 
+    except Exception as e:
+        print(f"❌ Error: {e}")
 
+    finally:
+        sio.disconnect()
+        print("🔌 Disconnected from server")
@@ -0,0 +1,284 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import time
+
+import eventlet
+
+from arduino_controller import ArduinoController
+
+# Longest sleep between checks while a greenthread waits on a board's worker
+POLL_INTERVAL = 0.05
+
+# Longest wait between reconnect attempts for a board that keeps failing
+MAX_BACKOFF = 300
+
+def wait_futures(futures, timeout=None):
+    """
+    Wait from a greenthread until all futures are done or the timeout passes.
+    Polls with eventlet.sleep, so no native thread is held while waiting and
+    any number of boards can be waited on at once.
+    Returns True if every future finished in time.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = 0.001
+    while not all(future.done() for future in futures):
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        eventlet.sleep(delay)
+        delay = min(delay * 2, POLL_INTERVAL)
+    return True
+
+def connect_and_probe(controller, port, reset_delay):
+    """Open the port and only report success if the board answers a probe."""
+    return controller.connect(port, reset_delay) and controller.is_alive()
+
+class BoardSession:
+    """
+    One physical board: its port, controller and a dedicated I/O worker.
+
+    Every serial call for this board runs on its own single-thread
+    executor, so calls to one board are serialised and a slow or stuck
+    board never holds up another board or the web server.
+    """
+
+    def __init__(self, port, baud_rate=115200, reset_delay=2):
+        self.port = port
+        self.baud_rate = baud_rate
+        self.reset_delay = reset_delay
+        self.controller = None
+        self.executor = None
+        self.healthy = False
+        self.game_id = None
+        self.last_seen = None
+        # Health and reconnect bookkeeping
+        self.ever_connected = False
+        self.missed_probes = 0
+        self.failures = 0
+        self.retry_at = 0
+        self.probe = None
+        self._last_job = None
+
+    @property
+    def busy(self):
+        """True while the worker still has queued or running jobs."""
+        return self._last_job is not None and not self._last_job.done()
+
+    def open(self):
+        """Start a fresh worker and connect on it. Returns a Future of the result."""
+        if self.executor:
+            self.close()
+        self.controller = ArduinoController(self.baud_rate)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"board-{self.port}")
+        self._last_job = self.executor.submit(connect_and_probe, self.controller,
+                                              self.port, self.reset_delay)
+        return self._last_job
+
+    def close(self):
+        """Close the port and retire the worker without waiting for it."""
+        self.healthy = False
+        if self.controller:
+            try:
+                # Closing from here also unblocks a worker stuck in a read
+                self.controller.close()
+            except Exception as e:
+                print(f"❌ Error closing board on {self.port}: {e}")
+        if self.executor:
+            self.executor.shutdown(wait=False)
+
+    def submit(self, func, *args, **kwargs):
+        """Queue func(controller, *args) on this board's worker. Returns a Future."""
+        # The worker is FIFO, so once the last job is done all earlier ones are too
+        self._last_job = self.executor.submit(func, self.controller, *args, **kwargs)
+        return self._last_job
+
+    def run(self, func, *args, timeout=None, **kwargs):
+        """
+        Run func(controller, *args) on this board's worker and wait for it.
+        Only this greenthread waits; other greenthreads and boards keep running.
+        Raises concurrent.futures.TimeoutError if the board does not answer,
+        and marks the board unhealthy so the health check reconnects it.
+        """
+        future = self.submit(func, *args, **kwargs)
+        if not wait_futures([future], timeout):
+            self.healthy = False
+            raise TimeoutError(f"Board on {self.port} did not answer within {timeout}s")
+        return future.result()
+
+    def call(self, method, *args, timeout=None, **kwargs):
+        """Call an ArduinoController method by name on this board's worker."""
+        return self.run(lambda controller: getattr(controller, method)(*args, **kwargs),
+                        timeout=timeout)
+
+class BoardManager:
+    """
+    Keeps a pool of connected boards, health-checks them and binds each
+    to a game session.
+    """
+
+    def __init__(self, baud_rate=115200, reset_delay=2, health_interval=5, health_timeout=2,
+                 max_missed_probes=3):
+        self.baud_rate = baud_rate
+        self.reset_delay = reset_delay
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.max_missed_probes = max_missed_probes
+        self.boards = {}
+        self._health_checker = None
+
+    def discover(self):
+        """Return the ports of all attached boards."""
+        return ArduinoController().find_ports()
+
+    def connect_all(self, ports=None):
+        """
+        Connect to every given port (default: all discovered ports) that
+        is not already in the pool. All boards connect and reset in
+        parallel, so startup costs one reset delay rather than one per board.
+        Returns the list of ports that connected.
+
+        A failed reconnect backs off exponentially before the next attempt.
+        A port that has never answered is not retried by the health check.
+        """
+        if ports is None:
+            ports = self.discover()
+
+        pending = {}
+        for port in ports:
+            if port in self.boards and self.boards[port].healthy:
+                continue
+            board = self.boards.get(port) or BoardSession(port, self.baud_rate, self.reset_delay)
+            self.boards[port] = board
+            pending[board.open()] = board
+
+        connected = []
+        if pending:
+            # Each board connects on its own worker; just wait for all of them
+            wait_futures(pending, self.reset_delay + self.health_timeout)
+        for future, board in pending.items():
+            board.healthy = bool(future.done() and not future.exception() and future.result())
+            if board.healthy:
+                board.last_seen = time.monotonic()
+                board.ever_connected = True
+                board.missed_probes = 0
+                board.failures = 0
+                board.probe = None
+                connected.append(board.port)
+            else:
+                board.failures += 1
+                backoff = min(self.health_interval * 2 ** board.failures, MAX_BACKOFF)
+                board.retry_at = time.monotonic() + backoff
+                if board.ever_connected:
+                    print(f"❌ Could not reconnect board on {board.port}, retrying in {backoff:.0f}s")
+                else:
+                    print(f"❌ No board answered on {board.port}, not retrying it")
+                board.close()
+        return connected
+
+    def bind(self, game_id, port=None):
+        """
+        Bind a board to a game session. With no port, picks any healthy
+        unbound board. Returns the BoardSession, or None if none is free.
+        """
+        current = self.board_for(game_id)
+        if current and (port is None or current.port == port):
+            return current
+
+        if port is not None:
+            candidates = [self.boards.get(port)]
+        else:
+            candidates = [b for b in self.boards.values() if b.healthy]
+
+        for board in candidates:
+            if board and board.game_id is None:
+                self.release(game_id)
+                board.game_id = game_id
+                print(f"🔗 Board on {board.port} bound to game {game_id}")
+                return board
+        return None
+
+    def release(self, game_id):
+        """Unbind whatever board is bound to a game session."""
+        for board in self.boards.values():
+            if board.game_id == game_id:
+                board.game_id = None
+
+    def board_for(self, game_id):
+        """Return the board bound to a game session, or None."""
+        for board in self.boards.values():
+            if board.game_id == game_id:
+                return board
+        return None
+
+    def check_health(self):
+        """
+        Probe every board in parallel. A board is closed and reconnected
+        after max_missed_probes probes in a row go unanswered; newly
+        attached ports are added.
+        """
+        probes = {}
+        for board in self.boards.values():
+            if not board.healthy:
+                continue
+            if board.probe is not None and not board.probe.done():
+                # The last probe is still queued behind a job that has not finished
+                self._missed_probe(board)
+            elif not board.busy:
+                # A board with other work in flight is covered by that caller's timeout
+                board.probe = board.submit(ArduinoController.is_alive)
+                probes[board.probe] = board
+
+        if probes:
+            wait_futures(probes, self.health_timeout)
+
+        for future, board in probes.items():
+            if future.done() and not future.exception() and future.result():
+                board.last_seen = time.monotonic()
+                board.missed_probes = 0
+            else:
+                self._missed_probe(board)
+
+        # Forget ports that never answered once they are unplugged, so a new
+        # device on the same port gets a fresh try
+        discovered = set(self.discover())
+        for port, board in list(self.boards.items()):
+            if not board.ever_connected and port not in discovered and board.game_id is None:
+                del self.boards[port]
+
+        # Try newly attached ports once, and boards that went down once their backoff has passed
+        now = time.monotonic()
+        ports = [p for p in discovered if p not in self.boards]
+        ports += [p for p, b in self.boards.items()
+                  if not b.healthy and b.ever_connected and b.retry_at <= now]
+        if ports:
+            for port in self.connect_all(ports):
+                print(f"✅ Board on {port} connected")
+
+    def _missed_probe(self, board):
+        """Count an unanswered probe and close the board once too many are missed."""
+        board.missed_probes += 1
+        if board.missed_probes < self.max_missed_probes:
+            print(f"⚠️ Board on {board.port} missed a health probe "
+                  f"({board.missed_probes}/{self.max_missed_probes})")
+            return
+        print(f"⚠️ Board on {board.port} is not responding, reconnecting")
+        board.close()
+
+    def start_health_checks(self):
+        """Run check_health every health_interval seconds in one background greenthread."""
+        if self._health_checker is None or self._health_checker.dead:
+            self._health_checker = eventlet.spawn(self._health_loop)
+
+    def _health_loop(self):
+        while True:
+            eventlet.sleep(self.health_interval)
+            try:
+                self.check_health()
+            except Exception as e:
+                print(f"❌ Error during board health check: {e}")
+
+    def close_all(self):
+        """Stop health checks and close every board."""
+        if self._health_checker is not None:
+            self._health_checker.kill()
+            self._health_checker = None
+        for board in self.boards.values():
+            board.close()
@@ -0,0 +1,204 @@
+import heapq
+import itertools
+import time
+
+import eventlet
+from eventlet.queue import LightQueue, Empty
+
+class GameClock:
+    """
+    Chess clock for a single game.
+
+    Remaining time is only settled when the clock is pressed, so reading
+    the clock never needs a timer: the running side's time is derived
+    from the monotonic clock on demand.
+    """
+
+    def __init__(self, initial=600, increment=0):
+        self.initial = initial
+        self.increment = increment
+        self.remaining = {'white': float(initial), 'black': float(initial)}
+        self.turn = 'white'
+        self.running = False
+        self.turn_started = None
+        self.flagged = None
+        self.moves = 0
+        # Bumped whenever the deadline changes so stale timers can be ignored
+        self.version = 0
+
+    def start(self, turn='white'):
+        """Start the clock for the side to move."""
+        if self.running or self.flagged:
+            return
+        self.turn = turn
+        self.turn_started = time.monotonic()
+        self.running = True
+        self.version += 1
+
+    def stop(self):
+        """Pause the clock, settling the running side's time."""
+        if not self.running:
+            return
+        self.remaining[self.turn] = self.time_left(self.turn)
+        self.running = False
+        self.turn_started = None
+        self.version += 1
+
+    def press(self):
+        """
+        Finish the current side's turn: charge the elapsed time, add the
+        increment and start the opponent's clock. While paused, the mover's
+        settled time gets the increment and the clock stays paused.
+        Returns False if the mover had already run out of time.
+        """
+        if self.flagged:
+            return False
+        self.moves += 1
+        if self.moves == 1:
+            # The first move starts the game clock for the other side
+            self.start('black' if self.turn == 'white' else 'white')
+            return True
+        if not self.running:
+            # Paused: no time passed for the mover since stop() settled it
+            self.remaining[self.turn] += self.increment
+            self.turn = 'black' if self.turn == 'white' else 'white'
+            self.version += 1
+            return True
+
+        now = time.monotonic()
+        left = self.remaining[self.turn] - (now - self.turn_started)
+        if left <= 0:
+            self.flag()
+            return False
+
+        self.remaining[self.turn] = left + self.increment
+        self.turn = 'black' if self.turn == 'white' else 'white'
+        self.turn_started = now
+        self.version += 1
+        return True
+
+    def flag(self):
+        """Mark the side to move as out of time and stop the clock."""
+        self.remaining[self.turn] = 0.0
+        self.flagged = self.turn
+        self.running = False
+        self.turn_started = None
+        self.version += 1
+
+    def time_left(self, side):
+        """Seconds left for a side, including the running turn."""
+        left = self.remaining[side]
+        if self.running and side == self.turn:
+            left -= time.monotonic() - self.turn_started
+        return max(left, 0.0)
+
+    def deadline(self):
+        """Monotonic time at which the running side flags, or None."""
+        if not self.running:
+            return None
+        return self.turn_started + self.remaining[self.turn]
+
+    def to_message(self):
+        """
+        Compact clock-sync message. Times are integer milliseconds; clients
+        count down locally from these values until the next sync.
+        """
+        return {
+            'w': int(self.time_left('white') * 1000),
+            'b': int(self.time_left('black') * 1000),
+            't': self.turn[0],
+            'r': self.running,
+            'f': self.flagged[0] if self.flagged else None
+        }
+
+class ClockService:
+    """
+    Owns the clocks of all games and flags timeouts from a single scheduler.
+
+    Deadlines live in one heap keyed by monotonic time. The scheduler
+    greenthread sleeps until the earliest deadline, so idle clocks cost
+    nothing and the work per move is a single heap push. Entries made
+    stale by a later press are skipped when popped.
+    """
+
+    def __init__(self, on_timeout=None):
+        self.clocks = {}
+        self.on_timeout = on_timeout
+        self._heap = []
+        self._counter = itertools.count()
+        self._wakeup = LightQueue()
+        self._scheduler = None
+
+    def create(self, game_id, initial=600, increment=0):
+        """Create (or replace) the clock for a game."""
+        self.clocks[game_id] = GameClock(initial, increment)
+        return self.clocks[game_id]
+
+    def get(self, game_id):
+        return self.clocks.get(game_id)
+
+    def remove(self, game_id):
+        """Forget a game's clock; its pending deadline is dropped when popped."""
+        self.clocks.pop(game_id, None)
+
+    def start(self, game_id, turn='white'):
+        """Start or resume a game's clock for the side to move."""
+        clock = self.clocks[game_id]
+        clock.start(turn)
+        self._schedule(game_id, clock)
+
+    def stop(self, game_id):
+        """Pause a game's clock; its pending deadline goes stale."""
+        self.clocks[game_id].stop()
+
+    def press(self, game_id):
+        """Press the clock after a move. Returns False if the mover flagged."""
+        clock = self.clocks[game_id]
+        if not clock.press():
+            self._notify(game_id, clock)
+            return False
+        self._schedule(game_id, clock)
+        return True
+
+    def _schedule(self, game_id, clock):
+        deadline = clock.deadline()
+        if deadline is None:
+            return
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (deadline, next(self._counter), game_id, clock.version))
+        self._ensure_scheduler()
+        # Only wake the scheduler if it is sleeping past the new deadline
+        if earliest is None or deadline < earliest:
+            self._wakeup.put(None)
+
+    def _ensure_scheduler(self):
+        if self._scheduler is None or self._scheduler.dead:
+            self._scheduler = eventlet.spawn(self._run)
+
+    def _run(self):
+        """Scheduler loop: sleep until the next deadline, then flag expired clocks."""
+        while True:
+            timeout = None
+            if self._heap:
+                timeout = max(self._heap[0][0] - time.monotonic(), 0)
+            try:
+                self._wakeup.get(timeout=timeout)
+                continue  # A new, earlier deadline was pushed
+            except Empty:
+                pass
+
+            now = time.monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, game_id, version = heapq.heappop(self._heap)
+                clock = self.clocks.get(game_id)
+                if clock is None or clock.version != version:
+                    continue  # Stale entry from an earlier press, pause or ended game
+                clock.flag()
+                self._notify(game_id, clock)
+
+    def _notify(self, game_id, clock):
+        if self.on_timeout:
+            try:
+                self.on_timeout(game_id, clock)
+            except Exception as e:
+                print(f"❌ Error in timeout handler for game {game_id}: {e}")
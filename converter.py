@@ -1,17 +1,37 @@
-def chess_move_to_vector(move: str):
-    # Define column and row mappings
-    columns = {'a': 5, 'b': 4, 'c': 3, 'd':2, 'e': 1,'f': 0}
-    rows = {'1': 0, '2': 1, '3': 2, '4': 3, '5': 4, '6': 5}
-    
-    # Parse the move (e.g., "a1-a2")
-    start, end = move.split(' ')
-    
-    # Get initial coordinates
-    x1, y1 = 30*columns[start[0]], 30*rows[start[1]]
-    x2, y2 = 30*columns[end[0]], 30*rows[end[1]]
-    
-    
-    return (x1, y1), (x2, y2)
+# Precompiled square lookups so move parsing never does ord/int arithmetic
+# With A6 at (0,0): files a-f map to columns 0-5, ranks 6-1 map to rows 0-5
+SQUARE_SIZE = 30  # mm between square centres on the physical board
+FILES = 'abcdef'
+RANKS = '654321'
+
+SQUARE_TO_INDEX = {
+    f"{file}{rank}": (row, col)
+    for row, rank in enumerate(RANKS)
+    for col, file in enumerate(FILES)
+}
+
+SQUARE_TO_PHYSICAL = {
+    square: (col * SQUARE_SIZE, row * SQUARE_SIZE)
+    for square, (row, col) in SQUARE_TO_INDEX.items()
+}
+
+def parse_move(chess_move):
+    """
+    Parse a move in chess notation (e.g., 'e2 e4') into board indices.
+    Returns ((start_row, start_col), (end_row, end_col)).
+
+    Raises ValueError with a short message if the text is not two valid
+    squares separated by a single space.
+    """
+    if not isinstance(chess_move, str) or len(chess_move) != 5 or chess_move[2] != ' ':
+        raise ValueError('Incorrect move format')
+
+    start = SQUARE_TO_INDEX.get(chess_move[:2])
+    end = SQUARE_TO_INDEX.get(chess_move[3:])
+    if start is None or end is None:
+        raise ValueError('Unknown square')
+
+    return start, end
 
 def chess_to_physical_coords(chess_move):
     """
@@ -25,22 +45,9 @@ def chess_to_physical_coords(chess_move):
     # Split the move into start and end positions
     start_pos, end_pos = chess_move.split()
     
-    def single_square_to_coords(square):
-        # Convert chess notation (e.g., 'e2') to physical coordinates
-        col = ord(square[0]) - ord('a')  # 'a' -> 0, 'b' -> 1, etc.
-        row = 6 - int(square[1])         # '6' -> 0, '5' -> 1, etc.
-        
-        # Calculate physical coordinates
-        # x = offset + (column * square_size) + (square_size / 2)
-        # y = offset + (row * square_size) + (square_size / 2)
-        x = (col * 30)  # Add 15mm to reach center
-        y = (row * 30)  # Add 15mm to reach center
-        
-        return x, y
-    
-    # Convert both start and end positions
-    start_x, start_y = single_square_to_coords(start_pos)
-    end_x, end_y = single_square_to_coords(end_pos)
+    # Look up both positions in the precompiled table
+    start_x, start_y = SQUARE_TO_PHYSICAL[start_pos]
+    end_x, end_y = SQUARE_TO_PHYSICAL[end_pos]
     
     # Format the command string
     command = f"MOVE {start_x} {start_y} {end_x} {end_y}"
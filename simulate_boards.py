@@ -0,0 +1,274 @@
+import os
+import pty
+import sys
+import threading
+import time
+import traceback
+import tty
+from concurrent.futures import TimeoutError
+
+import eventlet
+
+from board_manager import BoardManager
+
+# Checks for BoardManager against simulated Arduino boards on pseudo-terminals,
+# so multi-board behaviour can be verified without hardware.
+# Run with: python simulate_boards.py  (exits non-zero if any check fails)
+
+INITIAL_STATE = "110011" * 6  # Two rows of pieces for each side, transposed wiring
+MOVE_DURATION = 0.5
+RESET_DELAY = 0.5
+HEALTH_INTERVAL = 0.2  # Base for the reconnect backoff
+
+class FakeBoard:
+    """
+    Answers READ_BOARD and MOVE commands on the master side of a pty.
+    Setting stuck makes it swallow commands, like firmware that has hung.
+    """
+
+    def __init__(self, stuck=False):
+        self.master, slave = pty.openpty()
+        tty.setraw(slave)
+        self.port = os.ttyname(slave)
+        self._slave = slave  # Keep the slave open so the pty stays alive
+        self.stuck = stuck
+        self.state = INITIAL_STATE
+        self.received = []  # Every line written to the board, even while stuck
+        self.commands = []  # Lines the board actually answered
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        buffer = b""
+        while True:
+            try:
+                data = os.read(self.master, 1024)
+            except OSError:
+                return
+            if not data:
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                self.received.append(line.decode().strip())
+                if not self.stuck:
+                    self._handle(line.decode().strip())
+
+    def _handle(self, command):
+        self.commands.append(command)
+        if command == "READ_BOARD":
+            os.write(self.master, (self.state + "\n").encode())
+        elif command.startswith("MOVE"):
+            time.sleep(MOVE_DURATION)
+            os.write(self.master, b"MOVE_COMPLETE\n")
+
+    def close(self):
+        for fd in (self.master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+def make_boards(count, **kwargs):
+    """Start count fake boards and a manager connected to all of them."""
+    fakes = [FakeBoard() for _ in range(count)]
+    manager = BoardManager(reset_delay=RESET_DELAY, health_interval=HEALTH_INTERVAL,
+                           health_timeout=1, **kwargs)
+    connected = manager.connect_all([f.port for f in fakes])
+    return fakes, manager, connected
+
+def timed_call(board, method, *args, timeout):
+    """Call a controller method on a board; returns (result or exception, seconds)."""
+    start = time.monotonic()
+    try:
+        result = board.call(method, *args, timeout=timeout)
+    except Exception as e:
+        result = e
+    return result, time.monotonic() - start
+
+def check_connects_in_parallel():
+    start = time.monotonic()
+    fakes, manager, connected = make_boards(4)
+    elapsed = time.monotonic() - start
+    try:
+        assert sorted(connected) == sorted(f.port for f in fakes), connected
+        assert all(b.healthy for b in manager.boards.values())
+        # Four serial resets would take 2s; in parallel it is about one
+        assert elapsed < 2 * RESET_DELAY, f"connect took {elapsed:.2f}s"
+    finally:
+        manager.close_all()
+        for fake in fakes:
+            fake.close()
+
+def check_stuck_board_is_isolated():
+    fakes, manager, _ = make_boards(3)
+    try:
+        game_ids = [f"game-{i}" for i in range(len(fakes))]
+        bound = {game_id: manager.bind(game_id) for game_id in game_ids}
+        stuck_game = game_ids[-1]
+        stuck_fake = next(f for f in fakes if f.port == bound[stuck_game].port)
+        stuck_fake.stuck = True
+
+        def move(game_id):
+            board = bound[game_id]
+            board.call('send_command', 'MOVE 0 0 0 30', timeout=1)
+            return game_id, timed_call(board, 'wait_for_move_completion', 10,
+                                       timeout=MOVE_DURATION + 1)
+
+        results = dict(eventlet.GreenPool().imap(move, game_ids))
+        for game_id, (result, elapsed) in results.items():
+            if game_id == stuck_game:
+                assert isinstance(result, TimeoutError), result
+                assert elapsed >= MOVE_DURATION + 1
+                assert not bound[game_id].healthy
+            else:
+                assert result is True, f"{game_id}: {result}"
+                assert elapsed < MOVE_DURATION + 0.5, f"{game_id} took {elapsed:.2f}s"
+                assert bound[game_id].healthy
+
+        # Reconnecting cannot revive a board that stays silent, but it keeps its game
+        manager.check_health()
+        stuck_board = manager.board_for(stuck_game)
+        assert stuck_board is bound[stuck_game]
+        assert not stuck_board.healthy
+        for game_id in game_ids[:-1]:
+            assert manager.board_for(game_id).healthy
+
+        # The failed reconnect backs off instead of resetting the board every check
+        attempts = len(stuck_fake.received)
+        manager.check_health()
+        assert len(stuck_fake.received) == attempts, "reconnected before the backoff passed"
+
+        # Once the firmware answers again and the backoff has passed, it comes back
+        stuck_fake.stuck = False
+        eventlet.sleep(HEALTH_INTERVAL * 2)
+        manager.check_health()
+        assert stuck_board.healthy
+        assert manager.board_for(stuck_game) is stuck_board
+    finally:
+        manager.close_all()
+        for fake in fakes:
+            fake.close()
+
+def check_health_probe_catches_silent_board():
+    fakes, manager, _ = make_boards(2)
+    try:
+        fakes[0].stuck = True
+        # A missed probe or two is tolerated; the third closes the board
+        for _ in range(manager.max_missed_probes - 1):
+            manager.check_health()
+            assert manager.boards[fakes[0].port].healthy
+        manager.check_health()
+        assert not manager.boards[fakes[0].port].healthy
+        assert manager.boards[fakes[1].port].healthy
+    finally:
+        manager.close_all()
+        for fake in fakes:
+            fake.close()
+
+def check_silent_port_is_not_retried():
+    fakes = [FakeBoard(stuck=True)]
+    manager = BoardManager(reset_delay=RESET_DELAY, health_interval=HEALTH_INTERVAL, health_timeout=1)
+    try:
+        assert manager.connect_all([fakes[0].port]) == []
+        attempts = len(fakes[0].received)
+        assert attempts > 0
+        eventlet.sleep(HEALTH_INTERVAL * 4)
+        manager.check_health()
+        manager.check_health()
+        assert len(fakes[0].received) == attempts, "a port that never answered was retried"
+    finally:
+        manager.close_all()
+        for fake in fakes:
+            fake.close()
+
+def check_many_stuck_boards_do_not_starve_others():
+    # More stuck boards than eventlet's native thread pool has threads
+    fakes, manager, _ = make_boards(25)
+    try:
+        boards = [manager.boards[f.port] for f in fakes]
+        for fake in fakes[1:]:
+            fake.stuck = True
+
+        pool = eventlet.GreenPool()
+        for board in boards[1:]:
+            pool.spawn(timed_call, board, 'wait_for_move_completion', 10, timeout=3)
+        eventlet.sleep(0.1)  # Let every stuck wait get going
+
+        result, elapsed = timed_call(boards[0], 'read_board_state', timeout=1)
+        assert result == INITIAL_STATE, result
+        assert elapsed < 0.5, f"healthy board took {elapsed:.2f}s"
+        pool.waitall()
+    finally:
+        manager.close_all()
+        for fake in fakes:
+            fake.close()
+
+def check_app_routes_moves_to_each_games_board():
+    import app
+
+    fakes = [FakeBoard() for _ in range(2)]
+    app.boards.reset_delay = RESET_DELAY
+    try:
+        connected = app.boards.connect_all([f.port for f in fakes])
+        assert len(connected) == 2, connected
+        app.create_game('first')
+        app.create_game('second')
+        client = app.app.test_client()
+
+        assert client.post('/move', data={'game_id': 'first', 'move': 'a2 a3'}).json['success']
+        assert client.post('/move', data={'game_id': 'second', 'move': 'f2 f3'}).json['success']
+        eventlet.sleep(MOVE_DURATION + 0.5)
+
+        by_port = {f.port: f for f in fakes}
+        first = by_port[app.boards.board_for('first').port]
+        second = by_port[app.boards.board_for('second').port]
+        assert first is not second
+        assert "MOVE 0 120 0 90" in first.commands, first.commands
+        assert "MOVE 150 120 150 90" in second.commands, second.commands
+        assert not any(c.startswith("MOVE 0 ") for c in second.commands)
+
+        # Every board is bound, so a new game has none until another game ends
+        created = client.post('/games', data={}).json
+        assert created['success'] and created['board_port'] is None, created
+        assert client.post('/games', data={'game_id': created['game_id']}).status_code == 409
+        assert client.post('/games', data={}).json['game_id'] != created['game_id']
+
+        freed_port = app.boards.board_for('first').port
+        assert client.delete('/games/first').json['success']
+        assert 'first' not in app.games and app.clocks.get('first') is None
+        assert app.boards.board_for('first') is None
+
+        # The freed board picks up the next move of a game that had no board
+        game_id = created['game_id']
+        assert client.post('/move', data={'game_id': game_id, 'move': 'c2 c3'}).json['success']
+        eventlet.sleep(MOVE_DURATION + 0.5)
+        assert app.boards.board_for(game_id).port == freed_port
+        assert "MOVE 60 120 60 90" in by_port[freed_port].commands
+        assert client.delete('/games/first').status_code == 404
+    finally:
+        app.boards.close_all()
+        for fake in fakes:
+            fake.close()
+
+CHECKS = [
+    check_connects_in_parallel,
+    check_stuck_board_is_isolated,
+    check_health_probe_catches_silent_board,
+    check_silent_port_is_not_retried,
+    check_many_stuck_boards_do_not_starve_others,
+    check_app_routes_moves_to_each_games_board,
+]
+
+if __name__ == "__main__":
+    failures = 0
+    for check in CHECKS:
+        try:
+            check()
+            print(f"PASS {check.__name__}")
+        except Exception:
+            failures += 1
+            print(f"FAIL {check.__name__}")
+            traceback.print_exc()
+    print(f"{len(CHECKS) - failures} passed, {failures} failed")
+    sys.exit(1 if failures else 0)